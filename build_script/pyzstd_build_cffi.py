@@ -145,9 +145,13 @@ size_t ZSTD_compressStream2(ZSTD_CCtx* cctx,
                             ZSTD_outBuffer* output,
                             ZSTD_inBuffer* input,
                             ZSTD_EndDirective endOp);
+size_t ZSTD_compress2(ZSTD_CCtx* cctx,
+                      void* dst, size_t dstCapacity,
+                      const void* src, size_t srcSize);
 
 ZSTD_DCtx* ZSTD_createDCtx(void);
 size_t ZSTD_freeDCtx(ZSTD_DCtx* dctx);
+size_t ZSTD_sizeof_DCtx(const ZSTD_DCtx* dctx);
 size_t ZSTD_DCtx_reset(ZSTD_DCtx* dctx, ZSTD_ResetDirective reset);
 size_t ZSTD_decompressStream(ZSTD_DCtx* dctx,
                              ZSTD_outBuffer* output,
@@ -170,6 +174,10 @@ size_t ZDICT_finalizeDictionary(void* dstDictBuffer, size_t maxDictSize,
                                 const void* samplesBuffer, const size_t* samplesSizes, unsigned nbSamples,
                                 ZDICT_params_t parameters);
 
+size_t pyzstd_compress_mt_continue(ZSTD_CCtx* cctx,
+                                   ZSTD_outBuffer* output,
+                                   ZSTD_inBuffer* input);
+
 extern int pyzstd_static_link;
 """)
 
@@ -210,6 +218,22 @@ typedef enum {
 } PYZSTD_compat_c_targetCBlockSize;
 #endif
 
+/* Multi-threaded compression + .CONTINUE mode may return before the
+   input is consumed or the output is full, loop here rather than in
+   Python. */
+size_t pyzstd_compress_mt_continue(ZSTD_CCtx* cctx,
+                                   ZSTD_outBuffer* output,
+                                   ZSTD_inBuffer* input)
+{
+    size_t zstd_ret;
+    do {
+        zstd_ret = ZSTD_compressStream2(cctx, output, input, ZSTD_e_continue);
+    } while (output->pos != output->size &&
+             input->pos != input->size &&
+             !ZSTD_isError(zstd_ret));
+    return zstd_ret;
+}
+
 #ifdef PYZSTD_STATIC_LINK
 int pyzstd_static_link = 1;
 #else
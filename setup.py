@@ -1,13 +1,13 @@
 ﻿#!/usr/bin/env python3
 import fnmatch
 import os
-import platform
-import re
 import sys
 from setuptools import setup, Extension
 from setuptools.command.build_ext import build_ext
 
 def read_stuff():
+    import re
+
     ROOT_PATH = os.path.dirname(os.path.realpath(__file__))
 
     # Read README.md
@@ -70,7 +70,12 @@ class pyzstd_build_ext(build_ext):
                 #   This option runs the standard link-time optimizer. To use the
                 #   link-time optimizer, -flto and optimization options should be
                 #   specified at compile time and during the final link.
-                more_options = ['-g0', '-flto']
+                # -fvisibility=hidden:
+                #   Only export the module init function, it's explicitly
+                #   marked with default visibility in the C and CFFI code.
+                #   This reduces the dynamic symbol table and allows more
+                #   optimizations.
+                more_options = ['-g0', '-flto', '-fvisibility=hidden']
                 if self.PYZSTD_AVX2:
                     instrs = ['-mavx2', '-mlzcnt', '-mbmi', '-mbmi2']
                     more_options.extend(instrs)
@@ -98,6 +103,8 @@ class pyzstd_build_ext(build_ext):
         super().build_extensions()
 
 def do_setup():
+    import platform
+
     # Read stuff
     long_description, module_version = read_stuff()
 
@@ -109,7 +116,9 @@ def do_setup():
     DYNAMIC_LINK = has_option('--dynamic-link-zstd')
     CFFI = has_option('--cffi') or platform.python_implementation() == 'PyPy'
     MULTI_PHASE_INIT = has_option('--multi-phase-init')
+    NO_MULTI_PHASE_INIT = has_option('--no-multi-phase-init')
     NO_MREMAP = has_option('--no-mremap')
+    NO_MULTITHREAD = has_option('--no-multithread')
 
     # Build config message
     pyzstd_build_ext.PYZSTD_CONFIG_MSG = \
@@ -122,6 +131,8 @@ def do_setup():
                 '+-------------------------+------------------+\n'
                 '| Link to zstd library    | {!s:<16} |\n'
                 '+-------------------------+------------------+\n'
+                '| Multi-threaded compress | {!s:<16} |\n'
+                '+-------------------------+------------------+\n'
                 '| Enable AVX2/BMI2        | {!s:<16} |\n'
                 '+-------------------------+------------------+\n'
                 '| Debug build             | {!s:<16} |\n'
@@ -131,6 +142,7 @@ def do_setup():
                     module_version,
                     'CFFI' if CFFI else 'C',
                     'Dynamically link' if DYNAMIC_LINK else 'Statically link',
+                    'Depends on lib' if DYNAMIC_LINK else not NO_MULTITHREAD,
                     pyzstd_build_ext.PYZSTD_AVX2,
                     pyzstd_build_ext.PYZSTD_DEBUG,
                     pyzstd_build_ext.PYZSTD_WARNING_AS_ERROR)
@@ -153,9 +165,15 @@ def do_setup():
             'libraries': [],
             'sources': get_zstd_files_list(),
             'define_macros': [('PYZSTD_STATIC_LINK', None),
-                              # Enable multi-threaded compression
-                              ('ZSTD_MULTITHREAD', None)]
+                              # Don't export zstd library's symbols
+                              ('ZSTDLIB_VISIBILITY', ''),
+                              ('ZDICTLIB_VISIBILITY', ''),
+                              ('ZSTDERRORLIB_VISIBILITY', '')]
         }
+        if not NO_MULTITHREAD:
+            # Enable multi-threaded compression. For single-core targets,
+            # --no-multithread avoids zstd's pthread dependency.
+            kwargs['define_macros'].append(('ZSTD_MULTITHREAD', None))
 
     if CFFI:
         # Packages
@@ -174,9 +192,11 @@ def do_setup():
         # Binary extension
         kwargs['name'] = 'pyzstd.c._zstd'
         kwargs['sources'].append('src/bin_ext/pyzstd.c')
-        if MULTI_PHASE_INIT:
-            # Use multi-phase initialization (PEP-489) on CPython 3.11.
-            # On CPython 3.12+, it's always enabled.
+        if not NO_MULTI_PHASE_INIT and \
+           (MULTI_PHASE_INIT or sys.version_info >= (3, 11)):
+            # Use multi-phase initialization (PEP-489) on CPython 3.11+ by
+            # default, --no-multi-phase-init disables it on CPython 3.11.
+            # On CPython 3.12+, it's always enabled, see pyzstd.h.
             kwargs['define_macros'].append(('USE_MULTI_PHASE_INIT', None))
         if NO_MREMAP:
             # Disable mremap output buffer on Linux
@@ -1,3 +1,7 @@
+from array import array as _array
+from struct import calcsize as _calcsize
+from threading import local as _local
+
 try:
     # Import C implementation
     from .c import *
@@ -44,6 +48,46 @@ __all__ = ('ZstdCompressor', 'RichMemZstdCompressor',
 zstd_support_multithread = (CParameter.nbWorkers.bounds() != (0, 0))
 
 
+# Each thread caches the compressor of the last compress() and
+# richmem_compress() calls that use an int compression level (or None) and
+# no dictionary. Creating a compression context costs more than compressing
+# a small input.
+_compress_cache = _local()
+
+# Only small inputs use the cached compressor. The context's working memory
+# grows with the input size, a large input gets a fresh compressor, so that
+# the cache doesn't keep a large context alive.
+_COMPRESS_CACHE_MAX_SIZE = 128*1024
+
+def _nbytes(dat):
+    if isinstance(dat, (bytes, bytearray)):
+        return len(dat)
+    with memoryview(dat) as mv:
+        return mv.nbytes
+
+def _get_compressor(cls, data, level_or_option, zstd_dict):
+    # A cached dictionary would be kept alive in every thread that used it.
+    if zstd_dict is not None or \
+       (level_or_option is not None and type(level_or_option) is not int):
+        return cls(level_or_option, zstd_dict)
+
+    try:
+        size = _nbytes(data)
+    except TypeError:
+        # Not a bytes-like object, the compressor raises the error.
+        return cls(level_or_option)
+    if size > _COMPRESS_CACHE_MAX_SIZE:
+        return cls(level_or_option)
+
+    # Reuse the compressor. After a FLUSH_FRAME compression, or an
+    # exception, it's at the beginning of a new frame.
+    cached = getattr(_compress_cache, cls.__name__, None)
+    if cached is not None and cached[0] == level_or_option:
+        return cached[1]
+    comp = cls(level_or_option)
+    setattr(_compress_cache, cls.__name__, (level_or_option, comp))
+    return comp
+
 def compress(data, level_or_option=None, zstd_dict=None):
     """Compress a block of data, return a bytes object.
 
@@ -56,7 +100,8 @@ def compress(data, level_or_option=None, zstd_dict=None):
                      parameters.
     zstd_dict:       A ZstdDict object, pre-trained dictionary for compression.
     """
-    comp = ZstdCompressor(level_or_option, zstd_dict)
+    comp = _get_compressor(ZstdCompressor, data,
+                           level_or_option, zstd_dict)
     return comp.compress(data, ZstdCompressor.FLUSH_FRAME)
 
 
@@ -75,15 +120,29 @@ def richmem_compress(data, level_or_option=None, zstd_dict=None):
                      parameters.
     zstd_dict:       A ZstdDict object, pre-trained dictionary for compression.
     """
-    comp = RichMemZstdCompressor(level_or_option, zstd_dict)
+    comp = _get_compressor(RichMemZstdCompressor, data,
+                           level_or_option, zstd_dict)
     return comp.compress(data)
 
 
-def _nbytes(dat):
-    if isinstance(dat, (bytes, bytearray)):
-        return len(dat)
-    with memoryview(dat) as mv:
-        return mv.nbytes
+# array.array typecode of C size_t type
+_SIZE_T_TYPECODE = next(t for t in 'ILQ'
+                        if _array(t).itemsize == _calcsize('N'))
+
+# return: (samples_bytes, samples_size_list)
+# samples_bytes is a bytearray, samples_size_list is an array.array of
+# size_t values, both are passed to C code through buffer protocol.
+def _prepare_samples(samples):
+    # Append each sample to the concatenation buffer, without keeping a
+    # reference to it. If samples is a generator, peak memory is about the
+    # concatenation's size, rather than twice of it.
+    chunks = bytearray()
+    chunk_sizes = _array(_SIZE_T_TYPECODE)
+    for chunk in samples:
+        start = len(chunks)
+        chunks += chunk
+        chunk_sizes.append(len(chunks) - start)
+    return chunks, chunk_sizes
 
 
 def train_dict(samples, dict_size):
@@ -99,18 +158,12 @@ def train_dict(samples, dict_size):
         raise TypeError('dict_size argument should be an int object.')
 
     # Prepare data
-    chunks = []
-    chunk_sizes = []
-    for chunk in samples:
-        chunks.append(chunk)
-        chunk_sizes.append(_nbytes(chunk))
-
-    chunks = b''.join(chunks)
+    chunks, chunk_sizes = _prepare_samples(samples)
     if not chunks:
         raise ValueError("The samples are empty content, can't train dictionary.")
 
     # samples_bytes: samples be stored concatenated in a single flat buffer.
-    # samples_size_list: a list of each sample's size.
+    # samples_size_list: an array of each sample's size.
     # dict_size: size of the dictionary, in bytes.
     dict_content = _train_dict(chunks, chunk_sizes, dict_size)
 
@@ -153,19 +206,13 @@ def finalize_dict(zstd_dict, samples, dict_size, level):
         raise TypeError('level argument should be an int object.')
 
     # Prepare data
-    chunks = []
-    chunk_sizes = []
-    for chunk in samples:
-        chunks.append(chunk)
-        chunk_sizes.append(_nbytes(chunk))
-
-    chunks = b''.join(chunks)
+    chunks, chunk_sizes = _prepare_samples(samples)
     if not chunks:
         raise ValueError("The samples are empty content, can't finalize dictionary.")
 
     # custom_dict_bytes: existing dictionary.
     # samples_bytes: samples be stored concatenated in a single flat buffer.
-    # samples_size_list: a list of each sample's size.
+    # samples_size_list: an array of each sample's size.
     # dict_size: maximal size of the dictionary, in bytes.
     # compression_level: compression level expected to use in production.
     dict_content = _finalize_dict(zstd_dict.dict_content,
@@ -189,6 +189,7 @@ class ZstdFile(io.BufferedIOBase):
     def close(self) -> None: ...
 
     def write(self, data) -> int: ...
+    def writelines(self, lines: Iterable) -> None: ...
     def flush(self,
               mode: Literal[1, 2] = ...) -> None: ...
 
@@ -292,6 +292,12 @@ ZstdCompressor_compress(ZstdCompressor *self, PyObject *args, PyObject *kwargs)
     /* Compress */
     if (self->use_multithread && mode == ZSTD_e_continue) {
         ret = compress_mt_continue_impl(self, &data);
+    } else if (data.len == 0 && mode == ZSTD_e_continue) {
+        /* Single-thread compression outputs nothing in this case, the
+           previous call has flushed everything. */
+        STATE_FROM_OBJ(self);
+        ret = MS_MEMBER(empty_bytes);
+        Py_INCREF(ret);
     } else {
         ret = compress_impl(self, &data, mode, 0);
     }
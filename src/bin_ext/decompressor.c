@@ -218,10 +218,13 @@ stream_decompress(ZstdDecompressor *self, PyObject *args, PyObject *kwargs,
                   ZSTD_CONTENTSIZE_ERROR   is (0ULL - 2)
 
                Use ZSTD_findFrameCompressedSize() to check complete frame,
-               prevent allocating too much memory for small input chunk. */
+               prevent allocating too much memory for small input chunk.
+               It walks all block headers, skip it when the size is not
+               larger than the output buffer's default first block. */
 
-            if (decompressed_size <= (uint64_t) PY_SSIZE_T_MAX &&
-                !ZSTD_isError(ZSTD_findFrameCompressedSize(data.buf, data.len)) )
+            if (decompressed_size <= (uint64_t) PYZSTD_OB_FIRST_SIZE ||
+                (decompressed_size <= (uint64_t) PY_SSIZE_T_MAX &&
+                 !ZSTD_isError(ZSTD_findFrameCompressedSize(data.buf, data.len))) )
             {
                 initial_buffer_size = (Py_ssize_t) decompressed_size;
             }
@@ -262,9 +265,21 @@ stream_decompress(ZstdDecompressor *self, PyObject *args, PyObject *kwargs,
         const size_t avail_total = self->input_buffer_size - used_now;
         assert(self->input_buffer_size >= used_now);
 
-        if (avail_total < (size_t) data.len) {
+        /* Moving the unconsumed data is only worth it when at least half
+           of the buffer has been consumed, otherwise grow the buffer. This
+           keeps the copying cost amortized O(1) per byte. */
+        if (avail_total < (size_t) data.len ||
+            (avail_now < (size_t) data.len &&
+             self->in_begin < self->input_buffer_size / 2)) {
             char *tmp;
-            const size_t new_size = used_now + data.len;
+            size_t new_size = used_now + data.len;
+
+            /* Grow geometrically, so that appending small chunks doesn't
+               reallocate and copy the unconsumed data on every call. */
+            if (self->input_buffer_size <= (size_t) PY_SSIZE_T_MAX / 2 &&
+                new_size < self->input_buffer_size * 2) {
+                new_size = self->input_buffer_size * 2;
+            }
 
             /* Allocate with new size */
             tmp = PyMem_Malloc(new_size);
@@ -743,6 +758,11 @@ static PyType_Spec EndlessZstdDecompressor_type_spec = {
     .slots = EndlessZstdDecompressor_slots,
 };
 
+/* decompress() caches a decompression context only if it's not larger than
+   this. The context keeps its window-sized buffers, a frame with a large
+   window shouldn't keep them allocated. */
+#define DECOMPRESS_CACHE_MAX_SIZE (1*MB)
+
 PyDoc_STRVAR(decompress_doc,
 "decompress(data, zstd_dict=None, option=None)\n"
 "----\n"
@@ -774,12 +794,29 @@ decompress(PyObject *module, PyObject *args, PyObject *kwargs)
     STATE_FROM_MODULE(module);
     PyObject *ret = NULL;
 
-    /* Initialize & set ZstdDecompressor */
-    self.dctx = ZSTD_createDCtx();
-    if (self.dctx == NULL) {
-        PyErr_SetString(MS_MEMBER(ZstdError),
-                        "Unable to create ZSTD_DCtx instance.");
-        goto error;
+    /* Empty data, no need to create a decompression context. When there
+       are zstd_dict/option arguments, go on to check them. */
+    if (data.len == 0 && zstd_dict == Py_None && option == Py_None) {
+        PyBuffer_Release(&data);
+        ret = MS_MEMBER(empty_bytes);
+        Py_INCREF(ret);
+        return ret;
+    }
+
+    /* Initialize & set ZstdDecompressor. Without zstd_dict/option
+       arguments, take the decompression context cached by a previous call,
+       creating it costs more than decompressing a small input. */
+    if (zstd_dict == Py_None && option == Py_None &&
+        MS_MEMBER(decompress_dctx) != NULL) {
+        self.dctx = MS_MEMBER(decompress_dctx);
+        MS_MEMBER(decompress_dctx) = NULL;
+    } else {
+        self.dctx = ZSTD_createDCtx();
+        if (self.dctx == NULL) {
+            PyErr_SetString(MS_MEMBER(ZstdError),
+                            "Unable to create ZSTD_DCtx instance.");
+            goto error;
+        }
     }
     self.at_frame_edge = 1;
 #ifdef USE_MULTI_PHASE_INIT
@@ -843,8 +880,18 @@ decompress(PyObject *module, PyObject *args, PyObject *kwargs)
 error:
     Py_CLEAR(ret);
 success:
-    /* Free decompression context */
-    ZSTD_freeDCtx(self.dctx);
+    if (zstd_dict == Py_None && option == Py_None &&
+        MS_MEMBER(decompress_dctx) == NULL && self.dctx != NULL &&
+        ZSTD_sizeof_DCtx(self.dctx) <= DECOMPRESS_CACHE_MAX_SIZE) {
+        /* Cache decompression context for the next call. The GIL is held,
+           so the cache is not accessed concurrently. Resetting session
+           never fail. */
+        ZSTD_DCtx_reset(self.dctx, ZSTD_reset_session_only);
+        MS_MEMBER(decompress_dctx) = self.dctx;
+    } else {
+        /* Free decompression context */
+        ZSTD_freeDCtx(self.dctx);
+    }
     /* Release data */
     PyBuffer_Release(&data);
     return ret;
@@ -266,24 +266,131 @@ static PyType_Spec zstddict_type_spec = {
 /* -------------------------
      Train dictionary code
    ------------------------- */
+
+/* Release the chunk sizes got by get_chunk_sizes(). */
+static void
+release_chunk_sizes(Py_buffer *sizes_view, size_t **chunk_sizes)
+{
+    if (sizes_view->obj != NULL) {
+        PyBuffer_Release(sizes_view);
+    } else {
+        PyMem_Free(*chunk_sizes);
+    }
+    *chunk_sizes = NULL;
+}
+
+/* Get each sample's size from samples_size_list, it can be a list of int
+   objects, or a C-contiguous buffer of size_t values (e.g. array.array).
+   For a buffer, *chunk_sizes points to the buffer's memory directly, and
+   the buffer is held in *sizes_view. For a list, *chunk_sizes is allocated
+   by PyMem_Malloc(), and sizes_view->obj is NULL.
+   On success, return 0, call release_chunk_sizes() after use.
+   On failure, return -1. */
+static int
+get_chunk_sizes(PyObject *samples_size_list, Py_ssize_t samples_len,
+                Py_buffer *sizes_view,
+                size_t **chunk_sizes, Py_ssize_t *chunks_number)
+{
+    Py_ssize_t sizes_sum;
+    Py_ssize_t i;
+
+    sizes_view->obj = NULL;
+    *chunk_sizes = NULL;
+
+    if (PyList_Check(samples_size_list)) {
+        *chunks_number = Py_SIZE(samples_size_list);
+    } else if (PyObject_CheckBuffer(samples_size_list)) {
+        const char *fmt;
+
+        if (PyObject_GetBuffer(samples_size_list, sizes_view,
+                               PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) < 0) {
+            return -1;
+        }
+
+        /* Only accept unsigned integers, with the same size as size_t. */
+        fmt = sizes_view->format;
+        if (fmt[0] == '@') {
+            fmt++;
+        }
+        if (sizes_view->itemsize != sizeof(size_t) ||
+            fmt[0] == '\0' || fmt[1] != '\0' || strchr("ILQN", fmt[0]) == NULL) {
+            PyErr_SetString(PyExc_TypeError,
+                            "samples_size_list argument should be a list, "
+                            "or a buffer of size_t values.");
+            goto error;
+        }
+        *chunks_number = sizes_view->len / sizes_view->itemsize;
+    } else {
+        PyErr_SetString(PyExc_TypeError,
+                        "samples_size_list argument should be a list, "
+                        "or a buffer of size_t values.");
+        return -1;
+    }
+
+    if ((size_t) *chunks_number > UINT32_MAX) {
+        PyErr_SetString(PyExc_ValueError,
+                        "The number of samples should <= UINT32_MAX.");
+        goto error;
+    }
+
+    if (sizes_view->obj != NULL) {
+        /* Use the buffer directly, no allocation and no per-item
+           conversion. */
+        *chunk_sizes = (size_t *) sizes_view->buf;
+    } else {
+        *chunk_sizes = PyMem_Malloc(*chunks_number * sizeof(size_t));
+        if (*chunk_sizes == NULL) {
+            PyErr_NoMemory();
+            goto error;
+        }
+
+        for (i = 0; i < *chunks_number; i++) {
+            PyObject *size = PyList_GET_ITEM(samples_size_list, i);
+            (*chunk_sizes)[i] = PyLong_AsSize_t(size);
+            if ((*chunk_sizes)[i] == (size_t)-1 && PyErr_Occurred()) {
+                PyErr_SetString(PyExc_ValueError,
+                                "Items in samples_size_list should be an int "
+                                "object, with a size_t value.");
+                goto error;
+            }
+        }
+    }
+
+    sizes_sum = 0;
+    for (i = 0; i < *chunks_number; i++) {
+        sizes_sum += (*chunk_sizes)[i];
+    }
+
+    if (sizes_sum != samples_len) {
+        PyErr_SetString(PyExc_ValueError,
+                        "The samples size list doesn't match the concatenation's size.");
+        goto error;
+    }
+    return 0;
+
+error:
+    release_chunk_sizes(sizes_view, chunk_sizes);
+    return -1;
+}
+
 PyDoc_STRVAR(_train_dict_doc,
 "Internal function, train a zstd dictionary.");
 
 static PyObject *
 _train_dict(PyObject *module, PyObject *args)
 {
-    PyBytesObject *samples_bytes;
+    Py_buffer samples_bytes;
     PyObject *samples_size_list;
     Py_ssize_t dict_size;
 
     Py_ssize_t chunks_number;
+    Py_buffer sizes_view;
     size_t *chunk_sizes = NULL;
     PyObject *dst_dict_bytes = NULL;
     size_t zstd_ret;
-    Py_ssize_t sizes_sum;
-    Py_ssize_t i;
 
-    if (!PyArg_ParseTuple(args, "SOn:_train_dict",
+    sizes_view.obj = NULL;
+    if (!PyArg_ParseTuple(args, "y*On:_train_dict",
                           &samples_bytes, &samples_size_list, &dict_size)) {
         return NULL;
     }
@@ -291,45 +398,12 @@ _train_dict(PyObject *module, PyObject *args)
     /* Check arguments */
     if (dict_size <= 0) {
         PyErr_SetString(PyExc_ValueError, "dict_size argument should be positive number.");
-        return NULL;
-    }
-
-    if (!PyList_Check(samples_size_list)) {
-        PyErr_SetString(PyExc_TypeError,
-                        "samples_size_list argument should be a list.");
-        return NULL;
-    }
-
-    chunks_number = Py_SIZE(samples_size_list);
-    if ((size_t) chunks_number > UINT32_MAX) {
-        PyErr_SetString(PyExc_ValueError,
-                        "The number of samples should <= UINT32_MAX.");
-        return NULL;
-    }
-
-    /* Prepare chunk_sizes */
-    chunk_sizes = PyMem_Malloc(chunks_number * sizeof(size_t));
-    if (chunk_sizes == NULL) {
-        PyErr_NoMemory();
         goto error;
     }
 
-    sizes_sum = 0;
-    for (i = 0; i < chunks_number; i++) {
-        PyObject *size = PyList_GET_ITEM(samples_size_list, i);
-        chunk_sizes[i] = PyLong_AsSize_t(size);
-        if (chunk_sizes[i] == (size_t)-1 && PyErr_Occurred()) {
-            PyErr_SetString(PyExc_ValueError,
-                            "Items in samples_size_list should be an int "
-                            "object, with a size_t value.");
-            goto error;
-        }
-        sizes_sum += chunk_sizes[i];
-    }
-
-    if (sizes_sum != Py_SIZE(samples_bytes)) {
-        PyErr_SetString(PyExc_ValueError,
-                        "The samples size list doesn't match the concatenation's size.");
+    /* Prepare chunk_sizes */
+    if (get_chunk_sizes(samples_size_list, samples_bytes.len, &sizes_view,
+                        &chunk_sizes, &chunks_number) < 0) {
         goto error;
     }
 
@@ -342,7 +416,7 @@ _train_dict(PyObject *module, PyObject *args)
     /* Train the dictionary */
     Py_BEGIN_ALLOW_THREADS
     zstd_ret = ZDICT_trainFromBuffer(PyBytes_AS_STRING(dst_dict_bytes), dict_size,
-                                     PyBytes_AS_STRING(samples_bytes),
+                                     samples_bytes.buf,
                                      chunk_sizes, (uint32_t)chunks_number);
     Py_END_ALLOW_THREADS
 
@@ -364,7 +438,8 @@ error:
     Py_CLEAR(dst_dict_bytes);
 
 success:
-    PyMem_Free(chunk_sizes);
+    release_chunk_sizes(&sizes_view, &chunk_sizes);
+    PyBuffer_Release(&samples_bytes);
     return dst_dict_bytes;
 }
 
@@ -395,20 +470,20 @@ _finalize_dict(PyObject *module, PyObject *args)
     }
 
     PyBytesObject *custom_dict_bytes;
-    PyBytesObject *samples_bytes;
+    Py_buffer samples_bytes;
     PyObject *samples_size_list;
     Py_ssize_t dict_size;
     int compression_level;
 
     Py_ssize_t chunks_number;
+    Py_buffer sizes_view;
     size_t *chunk_sizes = NULL;
     PyObject *dst_dict_bytes = NULL;
     size_t zstd_ret;
     ZDICT_params_t params;
-    Py_ssize_t sizes_sum;
-    Py_ssize_t i;
 
-    if (!PyArg_ParseTuple(args, "SSOni:_finalize_dict",
+    sizes_view.obj = NULL;
+    if (!PyArg_ParseTuple(args, "Sy*Oni:_finalize_dict",
                           &custom_dict_bytes, &samples_bytes, &samples_size_list,
                           &dict_size, &compression_level)) {
         return NULL;
@@ -417,45 +492,12 @@ _finalize_dict(PyObject *module, PyObject *args)
     /* Check arguments */
     if (dict_size <= 0) {
         PyErr_SetString(PyExc_ValueError, "dict_size argument should be positive number.");
-        return NULL;
-    }
-
-    if (!PyList_Check(samples_size_list)) {
-        PyErr_SetString(PyExc_TypeError,
-                        "samples_size_list argument should be a list.");
-        return NULL;
-    }
-
-    chunks_number = Py_SIZE(samples_size_list);
-    if ((size_t) chunks_number > UINT32_MAX) {
-        PyErr_SetString(PyExc_ValueError,
-                        "The number of samples should <= UINT32_MAX.");
-        return NULL;
-    }
-
-    /* Prepare chunk_sizes */
-    chunk_sizes = PyMem_Malloc(chunks_number * sizeof(size_t));
-    if (chunk_sizes == NULL) {
-        PyErr_NoMemory();
         goto error;
     }
 
-    sizes_sum = 0;
-    for (i = 0; i < chunks_number; i++) {
-        PyObject *size = PyList_GET_ITEM(samples_size_list, i);
-        chunk_sizes[i] = PyLong_AsSize_t(size);
-        if (chunk_sizes[i] == (size_t)-1 && PyErr_Occurred()) {
-            PyErr_SetString(PyExc_ValueError,
-                            "Items in samples_size_list should be an int "
-                            "object, with a size_t value.");
-            goto error;
-        }
-        sizes_sum += chunk_sizes[i];
-    }
-
-    if (sizes_sum != Py_SIZE(samples_bytes)) {
-        PyErr_SetString(PyExc_ValueError,
-                        "The samples size list doesn't match the concatenation's size.");
+    /* Prepare chunk_sizes */
+    if (get_chunk_sizes(samples_size_list, samples_bytes.len, &sizes_view,
+                        &chunk_sizes, &chunks_number) < 0) {
         goto error;
     }
 
@@ -479,7 +521,7 @@ _finalize_dict(PyObject *module, PyObject *args)
     zstd_ret = ZDICT_finalizeDictionary(
                         PyBytes_AS_STRING(dst_dict_bytes), dict_size,
                         PyBytes_AS_STRING(custom_dict_bytes), Py_SIZE(custom_dict_bytes),
-                        PyBytes_AS_STRING(samples_bytes), chunk_sizes,
+                        samples_bytes.buf, chunk_sizes,
                         (uint32_t)chunks_number, params);
     Py_END_ALLOW_THREADS
 
@@ -501,7 +543,8 @@ error:
     Py_CLEAR(dst_dict_bytes);
 
 success:
-    PyMem_Free(chunk_sizes);
+    release_chunk_sizes(&sizes_view, &chunk_sizes);
+    PyBuffer_Release(&samples_bytes);
     return dst_dict_bytes;
 #endif
 }
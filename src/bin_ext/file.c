@@ -81,6 +81,11 @@ typedef struct {
 #define PYZSTD_FUN_PREFIX(F) file_##F
 #include "macro_functions.h"
 
+/* readall() trusts the content size in a frame header up to this size.
+   The header is not verified until the frame is decompressed, a corrupt
+   header may claim any size. */
+#define READALL_PRESIZE_MAX (16*MB)
+
 /* -----------------------
      ZstdFileReader code
    ----------------------- */
@@ -194,6 +199,38 @@ ZstdFileReader_dealloc(ZstdFileReader *self)
     Py_DECREF(tp);
 }
 
+/* Read a chunk from fp, and set it as input buffer.
+   On success, return 0. If fp is at EOF, in.size is 0.
+   On failure, return -1. */
+FORCE_INLINE int
+read_input(ZstdFileReader *self)
+{
+    Py_buffer buf;
+
+    /* Read */
+    Py_XDECREF(self->in_dat);
+    {
+        STATE_FROM_OBJ(self);
+        self->in_dat = invoke_method_one_arg(
+                            self->fp,
+                            MS_MEMBER(str_read),
+                            self->read_size);
+        if (self->in_dat == NULL) {
+            return -1;
+        }
+    }
+
+    /* Get address and length */
+    if (PyObject_GetBuffer(self->in_dat, &buf, PyBUF_SIMPLE) < 0) {
+        return -1;
+    }
+    self->in.src = buf.buf;
+    self->in.size = buf.len;
+    self->in.pos = 0;
+    PyBuffer_Release(&buf);
+    return 0;
+}
+
 /* If fill_full is true, fill the output buffer.
    If fill_full is false, only output once, then exit.
    On success, return 0.
@@ -202,7 +239,6 @@ FORCE_INLINE int
 decompress_into(ZstdFileReader *self,
                 ZSTD_outBuffer *out, const int fill_full)
 {
-    Py_buffer buf;
     const size_t orig_pos = out->pos;
     size_t zstd_ret;
 
@@ -213,32 +249,13 @@ decompress_into(ZstdFileReader *self,
 
     while (1) {
         if (self->in.size == self->in.pos && self->needs_input) {
-            void *read_buf;
-            Py_ssize_t read_len;
-
             /* Read */
-            Py_XDECREF(self->in_dat);
-            {
-                STATE_FROM_OBJ(self);
-                self->in_dat = invoke_method_one_arg(
-                                    self->fp,
-                                    MS_MEMBER(str_read),
-                                    self->read_size);
-                if (self->in_dat == NULL) {
-                    return -1;
-                }
-            }
-
-            /* Get address and length */
-            if (PyObject_GetBuffer(self->in_dat, &buf, PyBUF_SIMPLE) < 0) {
+            if (read_input(self) < 0) {
                 return -1;
             }
-            read_buf = buf.buf;
-            read_len = buf.len;
-            PyBuffer_Release(&buf);
 
             /* EOF */
-            if (read_len == 0) {
+            if (self->in.size == 0) {
                 if (self->at_frame_edge) {
                     self->eof = 1;
                     self->pos += out->pos - orig_pos;
@@ -251,9 +268,6 @@ decompress_into(ZstdFileReader *self,
                     return -1;
                 }
             }
-            self->in.src = read_buf;
-            self->in.size = read_len;
-            self->in.pos = 0;
         }
 
         /* Decompress */
@@ -298,17 +312,21 @@ ZstdFileReader_readinto(ZstdFileReader *self, PyObject *arg)
     ZSTD_outBuffer out;
     Py_buffer buf;
 
+    /* Hold the buffer until decompression finishes. The GIL is released
+       during decompression, and fp.read() may run arbitrary code, so the
+       buffer must not be resized or freed. */
     if (PyObject_GetBuffer(arg, &buf, PyBUF_WRITABLE) < 0) {
         return NULL;
     }
     out.dst = buf.buf;
     out.size = buf.len;
     out.pos = 0;
-    PyBuffer_Release(&buf);
 
     if (decompress_into(self, &out, 0) < 0) {
+        PyBuffer_Release(&buf);
         return NULL;
     }
+    PyBuffer_Release(&buf);
     return PyLong_FromSize_t(out.pos);
 }
 
@@ -332,8 +350,34 @@ ZstdFileReader_readall(ZstdFileReader *self)
         }
     } else {
         /* Unknown file size */
-        if (OutputBuffer_InitAndGrow(&buffer, &out, -1) < 0) {
-            goto error;
+        uint64_t content_size = ZSTD_CONTENTSIZE_UNKNOWN;
+
+        /* At a frame edge, the frame header may record the decompressed
+           size. Use it as the initial size, so that a single frame file
+           is decompressed into one exactly-sized bytes object, if the
+           size is not too large. */
+        if (self->at_frame_edge && !self->eof) {
+            if (self->in.size == self->in.pos) {
+                if (read_input(self) < 0) {
+                    goto error;
+                }
+            }
+            content_size = ZSTD_getFrameContentSize(
+                                (const char*)self->in.src + self->in.pos,
+                                self->in.size - self->in.pos);
+        }
+
+        /* ZSTD_CONTENTSIZE_UNKNOWN and ZSTD_CONTENTSIZE_ERROR are always
+           > READALL_PRESIZE_MAX. */
+        if (content_size <= READALL_PRESIZE_MAX) {
+            if (OutputBuffer_InitWithSize(&buffer, &out, -1,
+                                          (Py_ssize_t)content_size) < 0) {
+                goto error;
+            }
+        } else {
+            if (OutputBuffer_InitAndGrow(&buffer, &out, -1) < 0) {
+                goto error;
+            }
         }
     }
 
@@ -578,14 +622,15 @@ ZstdFileWriter_write(ZstdFileWriter *self, PyObject *arg)
     PyObject *ret;
     STATE_FROM_OBJ(self);
 
-    /* Input buffer */
+    /* Input buffer. Hold it until compression finishes, the GIL is
+       released during compression, and fp.write() may run arbitrary
+       code, so the buffer must not be resized or freed. */
     if (PyObject_GetBuffer(arg, &buf, PyBUF_SIMPLE) < 0) {
-        goto error;
+        return NULL;
     }
     in.src = buf.buf;
     in.size = buf.len;
     in.pos = 0;
-    PyBuffer_Release(&buf);
 
     /* Output buffer, out.pos will be set later. */
     out.dst = self->write_buffer;
@@ -639,10 +684,10 @@ ZstdFileWriter_write(ZstdFileWriter *self, PyObject *arg)
     }
 
     ret = Py_BuildValue("KK", (uint64_t)in.size, output_size);
-    if (ret != NULL) {
-        return ret;
-    }
+    PyBuffer_Release(&buf);
+    return ret;
 error:
+    PyBuffer_Release(&buf);
     return NULL;
 }
 
@@ -65,6 +65,8 @@ resize_bytes(PyObject **obj,
      mremap output buffer code
    ----------------------------- */
 #define PYZSTD_OB_INIT_SIZE (16*KB)
+/* Size of the first block allocated by OutputBuffer_InitAndGrow() */
+#define PYZSTD_OB_FIRST_SIZE PYZSTD_OB_INIT_SIZE
 
 typedef struct {
     /* Bytes object */
@@ -267,6 +269,8 @@ static const Py_ssize_t BUFFER_BLOCK_SIZE[] =
     { 32*KB, 64*KB, 256*KB, 1*MB, 4*MB, 8*MB, 16*MB, 16*MB,
       32*MB, 32*MB, 32*MB, 32*MB, 64*MB, 64*MB, 128*MB, 128*MB,
       256*MB };
+/* Size of the first block allocated by OutputBuffer_InitAndGrow() */
+#define PYZSTD_OB_FIRST_SIZE (BUFFER_BLOCK_SIZE[0])
 
 /* According to the block sizes defined by BUFFER_BLOCK_SIZE, the whole
    allocated size growth step is:
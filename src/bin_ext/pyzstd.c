@@ -567,6 +567,9 @@ _zstd_clear(PyObject *module)
 
     Py_CLEAR(MS_MEMBER(CParameter_type));
     Py_CLEAR(MS_MEMBER(DParameter_type));
+
+    ZSTD_freeDCtx(MS_MEMBER(decompress_dctx));
+    MS_MEMBER(decompress_dctx) = NULL;
     return 0;
 }
 
@@ -606,6 +609,11 @@ static inline PyModuleDef* _get_zstd_PyModuleDef()
 }
 #endif
 
+/* The module is built with -fvisibility=hidden. On Python 3.8 and older,
+   PyMODINIT_FUNC doesn't mark the init function as visible. */
+#if defined(__GNUC__)
+__attribute__((visibility("default")))
+#endif
 PyMODINIT_FUNC
 PyInit__zstd(void)
 {
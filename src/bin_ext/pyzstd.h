@@ -178,6 +178,9 @@ struct _zstd_state {
 
     PyTypeObject *CParameter_type;
     PyTypeObject *DParameter_type;
+
+    /* Decompression context cached by decompress() function */
+    ZSTD_DCtx *decompress_dctx;
 };
 
 #ifdef USE_MULTI_PHASE_INIT
@@ -458,15 +461,28 @@ _get_CDict(ZstdDict *self, int compressionLevel)
     PyObject *capsule;
     ZSTD_CDict *cdict;
 
-    ACQUIRE_LOCK(self);
-
     /* int level object */
     level = PyLong_FromLong(compressionLevel);
     if (level == NULL) {
-        goto error;
+        return NULL;
     }
 
-    /* Get PyCapsule object from self->c_dicts */
+    /* Already cached. self->c_dicts is protected by the GIL, the lock is
+       only needed to create ZSTD_CDict instance, which releases the GIL.
+       So threads using cached levels don't wait for the creation. */
+    capsule = PyDict_GetItemWithError(self->c_dicts, level);
+    if (capsule != NULL) {
+        Py_DECREF(level);
+        return PyCapsule_GetPointer(capsule, NULL);
+    } else if (PyErr_Occurred()) {
+        Py_DECREF(level);
+        return NULL;
+    }
+
+    ACQUIRE_LOCK(self);
+
+    /* Get PyCapsule object from self->c_dicts, another thread may have
+       created it while this thread was waiting for the lock. */
     capsule = PyDict_GetItemWithError(self->c_dicts, level);
     if (capsule == NULL) {
         if (PyErr_Occurred()) {
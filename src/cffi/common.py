@@ -294,32 +294,52 @@ def _write_to_fp(func_name, fp, out_mv, out_b):
     if out_b.pos == 0:
         return
 
-    write_ret = fp.write(out_mv[:out_b.pos])
+    # The output block is usually full, then no need to slice.
+    if out_b.pos == out_b.size:
+        write_ret = fp.write(out_mv)
+    else:
+        write_ret = fp.write(out_mv[:out_b.pos])
     if write_ret != out_b.pos:
         msg = ("%s returned invalid length %d "
                "(should be %d <= value <= %d)") % \
                (func_name, write_ret, out_b.pos, out_b.pos)
         raise ValueError(msg)
 
+# samples_size_list can be a list of int objects, or a buffer of size_t
+# values (e.g. array.array).
+# return: (size_t[] cdata, chunks_number)
+def _get_chunk_sizes(samples_size_list, samples_len):
+    if isinstance(samples_size_list, list):
+        # CFFI converts the list items in C.
+        _sizes = _new_nonzero("size_t[]", samples_size_list)
+        if _sizes == ffi.NULL:
+            raise MemoryError
+        _chunks_number = len(samples_size_list)
+        total = sum(samples_size_list)
+    else:
+        # Use the buffer directly, no per-item conversion.
+        with memoryview(samples_size_list) as mv:
+            if mv.itemsize != ffi.sizeof("size_t") \
+                    or mv.format.lstrip("@") not in ("I", "L", "Q", "N"):
+                raise TypeError("samples_size_list argument should be a "
+                                "list, or a buffer of size_t values.")
+            total = sum(mv)
+        _sizes = ffi.from_buffer("size_t[]", samples_size_list)
+        _chunks_number = len(_sizes)
+
+    if total != samples_len:
+        msg = "The samples size list doesn't match the concatenation's size."
+        raise ValueError(msg)
+    return _sizes, _chunks_number
+
 def _train_dict(samples_bytes, samples_size_list, dict_size):
     # C code
     if dict_size <= 0:
         raise ValueError("dict_size argument should be positive number.")
 
     # Prepare chunk_sizes
-    _chunks_number = len(samples_size_list)
-    _sizes = _new_nonzero("size_t[]", _chunks_number)
-    if _sizes == ffi.NULL:
-        raise MemoryError
-
-    _sizes_sum = 0
-    for i, size in enumerate(samples_size_list):
-        _sizes[i] = size
-        _sizes_sum += size
-
-    if _sizes_sum != _nbytes(samples_bytes):
-        msg = "The samples size list doesn't match the concatenation's size."
-        raise ValueError(msg)
+    _sizes, _chunks_number = _get_chunk_sizes(samples_size_list,
+                                              _nbytes(samples_bytes))
 
     # Allocate dict buffer
     _dst_dict_bytes = _new_nonzero("char[]", dict_size)
@@ -358,19 +378,8 @@ def _finalize_dict(custom_dict_bytes,
         raise ValueError("dict_size argument should be positive number.")
 
     # Prepare chunk_sizes
-    _chunks_number = len(samples_size_list)
-    _sizes = _new_nonzero("size_t[]", _chunks_number)
-    if _sizes == ffi.NULL:
-        raise MemoryError
-
-    _sizes_sum = 0
-    for i, size in enumerate(samples_size_list):
-        _sizes[i] = size
-        _sizes_sum += size
-
-    if _sizes_sum != _nbytes(samples_bytes):
-        msg = "The samples size list doesn't match the concatenation's size."
-        raise ValueError(msg)
+    _sizes, _chunks_number = _get_chunk_sizes(samples_size_list,
+                                              _nbytes(samples_bytes))
 
     # Allocate dict buffer
     _dst_dict_bytes = _new_nonzero("char[]", dict_size)
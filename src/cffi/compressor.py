@@ -7,6 +7,13 @@ from .common import m, ffi, _new_nonzero, _nbytes, \
 from .dict import _load_c_dict
 from .output_buffer import _BlocksOutputBuffer
 
+# Bound once, ZstdCompressor.compress() may be called very frequently.
+# Tuples rather than frozensets, so that an unhashable mode value still
+# raises ValueError.
+_e_continue = m.ZSTD_e_continue
+_COMPRESS_MODES = (m.ZSTD_e_continue, m.ZSTD_e_flush, m.ZSTD_e_end)
+_FLUSH_MODES = (m.ZSTD_e_end, m.ZSTD_e_flush)
+
 class _Compressor:
     def __init__(self, level_or_option=None, zstd_dict=None):
         self._use_multithread = False
@@ -21,6 +28,9 @@ class _Compressor:
         if self._singleton_out_buf == ffi.NULL:
             raise MemoryError
 
+        # Lazy create output buffer's first block, reused across calls.
+        self._first_block = ffi.NULL
+
         # Compression context
         self._cctx = m.ZSTD_createCCtx()
         if self._cctx == ffi.NULL:
@@ -43,7 +53,17 @@ class _Compressor:
         except AttributeError:
             pass
 
-    def _compress_impl(self, data, end_directive, rich_mem):
+    # Called with self._lock held, so the first block is not shared by
+    # concurrent calls.
+    def _init_output_buffer(self, out, out_buf):
+        if self._first_block == ffi.NULL:
+            self._first_block = _new_nonzero(
+                        "char[]", _BlocksOutputBuffer.BUFFER_BLOCK_SIZE[0])
+            if self._first_block == ffi.NULL:
+                raise MemoryError
+        out.initWithBlock(out_buf, self._first_block)
+
+    def _compress_impl(self, data, end_directive):
         # Input buffer
         in_buf = self._singleton_in_buf
         in_buf.src = ffi.from_buffer(data)
@@ -55,11 +75,7 @@ class _Compressor:
         out = _BlocksOutputBuffer()
 
         # Initialize output buffer
-        if rich_mem:
-            init_size = m.ZSTD_compressBound(_nbytes(data))
-            out.initWithSize(out_buf, -1, init_size)
-        else:
-            out.initAndGrow(out_buf, -1)
+        self._init_output_buffer(out, out_buf)
 
         while True:
             # Compress
@@ -75,6 +91,22 @@ class _Compressor:
             if out_buf.pos == out_buf.size:
                 out.grow(out_buf)
 
+    def _compress_rich_mem_impl(self, data):
+        # The whole input is known and the output buffer is large enough,
+        # so use the one-shot API rather than the streaming loop.
+        src_size = _nbytes(data)
+        dst_size = m.ZSTD_compressBound(src_size)
+        dst = _new_nonzero("char[]", dst_size)
+        if dst == ffi.NULL:
+            raise MemoryError
+
+        zstd_ret = m.ZSTD_compress2(self._cctx, dst, dst_size,
+                                    ffi.from_buffer(data), src_size)
+        if m.ZSTD_isError(zstd_ret):
+            _set_zstd_error(_ErrorType.ERR_COMPRESS, zstd_ret)
+
+        return ffi.buffer(dst)[:zstd_ret]
+
     def _compress_mt_continue_impl(self, data):
         # Input buffer
         in_buf = self._singleton_in_buf
@@ -85,18 +117,12 @@ class _Compressor:
         # Output buffer
         out_buf = self._singleton_out_buf
         out = _BlocksOutputBuffer()
-        out.initAndGrow(out_buf, -1)
+        self._init_output_buffer(out, out_buf)
 
         while True:
             # Compress
-            while True:
-                zstd_ret = m.ZSTD_compressStream2(self._cctx,
-                                                  out_buf, in_buf,
-                                                  m.ZSTD_e_continue)
-                if (out_buf.pos == out_buf.size
-                      or in_buf.pos == in_buf.size
-                      or m.ZSTD_isError(zstd_ret)):
-                    break
+            zstd_ret = m.pyzstd_compress_mt_continue(self._cctx,
+                                                     out_buf, in_buf)
 
             # Check error
             if m.ZSTD_isError(zstd_ret):
@@ -169,9 +195,7 @@ class ZstdCompressor(_Compressor):
         data: A bytes-like object, data to be compressed.
         mode: Can be these 3 values .CONTINUE, .FLUSH_BLOCK, .FLUSH_FRAME.
         """
-        if mode not in (ZstdCompressor.CONTINUE,
-                        ZstdCompressor.FLUSH_BLOCK,
-                        ZstdCompressor.FLUSH_FRAME):
+        if mode not in _COMPRESS_MODES:
             msg = ("mode argument wrong value, it should be one of "
                    "ZstdCompressor.CONTINUE, ZstdCompressor.FLUSH_BLOCK, "
                    "ZstdCompressor.FLUSH_FRAME.")
@@ -179,10 +203,14 @@ class ZstdCompressor(_Compressor):
 
         with self._lock:
             try:
-                if self._use_multithread and mode == ZstdCompressor.CONTINUE:
+                if self._use_multithread and mode == _e_continue:
                     ret = self._compress_mt_continue_impl(data)
+                elif mode == _e_continue and _nbytes(data) == 0:
+                    # Single-thread compression outputs nothing in this
+                    # case, the previous call has flushed everything.
+                    ret = b''
                 else:
-                    ret = self._compress_impl(data, mode, False)
+                    ret = self._compress_impl(data, mode)
                 self.__last_mode = mode
                 return ret
             except:
@@ -200,14 +228,14 @@ class ZstdCompressor(_Compressor):
         Parameter
         mode: Can be these 2 values .FLUSH_FRAME, .FLUSH_BLOCK.
         """
-        if mode not in (ZstdCompressor.FLUSH_FRAME, ZstdCompressor.FLUSH_BLOCK):
+        if mode not in _FLUSH_MODES:
             msg = ("mode argument wrong value, it should be "
                    "ZstdCompressor.FLUSH_FRAME or ZstdCompressor.FLUSH_BLOCK.")
             raise ValueError(msg)
 
         with self._lock:
             try:
-                ret = self._compress_impl(b"", mode, False)
+                ret = self._compress_impl(b"", mode)
                 self.__last_mode = mode
                 return ret
             except:
@@ -296,7 +324,7 @@ class RichMemZstdCompressor(_Compressor):
         """
         with self._lock:
             try:
-                ret = self._compress_impl(data, m.ZSTD_e_end, True)
+                ret = self._compress_rich_mem_impl(data)
                 return ret
             except:
                 # Resetting cctx's session never fail
@@ -1,7 +1,7 @@
 from threading import Lock
 
 from .common import m, ffi, ZstdError, \
-                    _new_nonzero, _set_d_parameters, \
+                    _new_nonzero, _nbytes, _set_d_parameters, \
                     _set_zstd_error, _ErrorType
 from .dict import _load_d_dict
 from .output_buffer import _BlocksOutputBuffer
@@ -114,6 +114,10 @@ class _Decompressor:
             initial_buffer_size = -1
             in_buf = self._singleton_in_buf
 
+            # Pin the input buffer once, it's used several times below.
+            data_cdata = ffi.from_buffer(data)
+            data_len = len(data)
+
             if self._type == _TYPE_DEC:
                 # Check .eof flag
                 if self._eof:
@@ -122,16 +126,20 @@ class _Decompressor:
                 # Fast path for the first frame
                 if self._at_frame_edge and self._in_begin == self._in_end:
                     # Read decompressed size
-                    decompressed_size = m.ZSTD_getFrameContentSize(ffi.from_buffer(data),
-                                                                   len(data))
+                    decompressed_size = m.ZSTD_getFrameContentSize(data_cdata,
+                                                                   data_len)
 
                     # Use ZSTD_findFrameCompressedSize() to check complete frame,
                     # prevent allocating too much memory for small input chunk.
-                    if (decompressed_size not in (m.ZSTD_CONTENTSIZE_UNKNOWN,
-                                                  m.ZSTD_CONTENTSIZE_ERROR) \
-                          and \
-                          not m.ZSTD_isError(m.ZSTD_findFrameCompressedSize(ffi.from_buffer(data),
-                                                                            len(data))) ):
+                    # It walks all block headers, skip it when the size is not
+                    # larger than the output buffer's default first block.
+                    if decompressed_size <= _BlocksOutputBuffer.BUFFER_BLOCK_SIZE[0] \
+                          or \
+                          (decompressed_size not in (m.ZSTD_CONTENTSIZE_UNKNOWN,
+                                                     m.ZSTD_CONTENTSIZE_ERROR) \
+                           and \
+                           not m.ZSTD_isError(m.ZSTD_findFrameCompressedSize(data_cdata,
+                                                                             data_len)) ):
                         initial_buffer_size = decompressed_size
 
             # Prepare input buffer w/wo unconsumed data
@@ -139,10 +147,10 @@ class _Decompressor:
                 # No unconsumed data
                 use_input_buffer = False
 
-                in_buf.src = ffi.from_buffer(data)
-                in_buf.size = len(data)
+                in_buf.src = data_cdata
+                in_buf.size = data_len
                 in_buf.pos = 0
-            elif len(data) == 0:
+            elif data_len == 0:
                 # Has unconsumed data, fast path for b"".
                 use_input_buffer = True
 
@@ -161,8 +169,17 @@ class _Decompressor:
                 # contents to beginning of buffer
                 avail_total = self._input_buffer_size - used_now
 
-                if avail_total < len(data):
-                    new_size = used_now + len(data)
+                # Moving the unconsumed data is only worth it when at least
+                # half of the buffer has been consumed, otherwise grow the
+                # buffer. This keeps the copying cost amortized O(1) per byte.
+                if avail_total < data_len or \
+                   (avail_now < data_len and
+                    self._in_begin < self._input_buffer_size // 2):
+                    # Grow geometrically, so that appending small chunks
+                    # doesn't reallocate and copy the unconsumed data on
+                    # every call.
+                    new_size = max(used_now + data_len,
+                                   self._input_buffer_size * 2)
                     # Allocate with new size
                     tmp = _new_nonzero("char[]", new_size)
                     if tmp == ffi.NULL:
@@ -180,7 +197,7 @@ class _Decompressor:
                     # Set begin & end position
                     self._in_begin = 0
                     self._in_end = used_now
-                elif avail_now < len(data):
+                elif avail_now < data_len:
                     # Move unconsumed data to the beginning
                     ffi.memmove(self._input_buffer,
                                 self._input_buffer+self._in_begin,
@@ -192,11 +209,11 @@ class _Decompressor:
 
                 # Copy data to input buffer
                 ffi.memmove(self._input_buffer+self._in_end,
-                            ffi.from_buffer(data), len(data))
-                self._in_end += len(data)
+                            data_cdata, data_len)
+                self._in_end += data_len
 
                 in_buf.src = self._input_buffer + self._in_begin
-                in_buf.size = used_now + len(data)
+                in_buf.size = used_now + data_len
                 in_buf.pos = 0
             # Now in_buf.pos == 0
 
@@ -369,6 +386,22 @@ class EndlessZstdDecompressor(_Decompressor):
         """
         return self._at_frame_edge
 
+# Decompressor cached by decompress() function, at most one item. list.pop()
+# and list.append() are atomic, so that a decompressor is not shared by
+# concurrent calls.
+_decompress_cache = []
+
+# decompress() caches a decompressor only if its decompression context is not
+# larger than this. The context keeps its window-sized buffers, a frame with a
+# large window shouldn't keep them allocated.
+_DECOMPRESS_CACHE_MAX_SIZE = 1024*1024
+
+def _get_cached_decompressor():
+    try:
+        return _decompress_cache.pop()
+    except IndexError:
+        return EndlessZstdDecompressor()
+
 def decompress(data, zstd_dict=None, option=None):
     """Decompress a zstd data, return a bytes object.
 
@@ -379,17 +412,30 @@ def decompress(data, zstd_dict=None, option=None):
     zstd_dict: A ZstdDict object, pre-trained zstd dictionary.
     option:    A dict object, contains advanced decompression parameters.
     """
-    # EndlessZstdDecompressor
-    decomp = EndlessZstdDecompressor(zstd_dict, option)
+    # Empty data, no need to create a decompression context. When there
+    # are zstd_dict/option arguments, go on to check them.
+    if zstd_dict is None and option is None and _nbytes(data) == 0:
+        return b''
+
+    # EndlessZstdDecompressor. Without zstd_dict/option arguments, take the
+    # decompressor cached by a previous call, creating the decompression
+    # context costs more than decompressing a small input.
+    use_cache = zstd_dict is None and option is None
+    if use_cache:
+        decomp = _get_cached_decompressor()
+    else:
+        decomp = EndlessZstdDecompressor(zstd_dict, option)
 
     # Prepare input data
+    data_cdata = ffi.from_buffer(data)
+    data_len = len(data)
     in_buf = decomp._singleton_in_buf
-    in_buf.src = ffi.from_buffer(data)
-    in_buf.size = len(data)
+    in_buf.src = data_cdata
+    in_buf.size = data_len
     in_buf.pos = 0
 
     # Get decompressed size
-    decompressed_size = m.ZSTD_getFrameContentSize(ffi.from_buffer(data), len(data))
+    decompressed_size = m.ZSTD_getFrameContentSize(data_cdata, data_len)
     if decompressed_size not in (m.ZSTD_CONTENTSIZE_UNKNOWN,
                                  m.ZSTD_CONTENTSIZE_ERROR):
         initial_size = decompressed_size
@@ -398,10 +444,17 @@ def decompress(data, zstd_dict=None, option=None):
 
     # Decompress
     ret = decomp._decompress_impl(in_buf, -1, initial_size)
+    at_frame_edge = decomp._at_frame_edge
+
+    # Cache the decompressor for the next call
+    if use_cache and not _decompress_cache and \
+       m.ZSTD_sizeof_DCtx(decomp._dctx) <= _DECOMPRESS_CACHE_MAX_SIZE:
+        decomp._reset_session()
+        _decompress_cache.append(decomp)
 
     # Check data integrity. at_frame_edge flag is True when the both the input
     # and output streams are at a frame edge.
-    if not decomp._at_frame_edge:
+    if not at_frame_edge:
         extra_msg = "." if (len(ret) == 0) \
                         else (", if want to output these decompressed data, use "
                               "decompress_stream function or "
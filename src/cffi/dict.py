@@ -36,10 +36,15 @@ class ZstdDict:
         if len(self.__dict_content) < 8:
             raise ValueError('Zstd dictionary content should at least 8 bytes.')
 
+        # Pointer and length of dictionary content, used when loading the
+        # dictionary. The pointer is valid as long as this object holds
+        # self.__dict_content, an immutable bytes object.
+        self._dict_cdata = ffi.from_buffer(self.__dict_content)
+        self._dict_len = len(self.__dict_content)
+
         # Get dict_id, 0 means "raw content" dictionary.
-        self.__dict_id = m.ZSTD_getDictID_fromDict(
-                                    ffi.from_buffer(self.__dict_content),
-                                    len(self.__dict_content))
+        self.__dict_id = m.ZSTD_getDictID_fromDict(self._dict_cdata,
+                                                   self._dict_len)
 
         # Check validity for ordinary dictionary
         if not is_raw and self.__dict_id == 0:
@@ -134,14 +139,22 @@ class ZstdDict:
         raise TypeError(msg)
 
     def _get_cdict(self, level):
+        # Already cached. The lock is only needed to create ZSTD_CDict
+        # instance, so threads using cached levels don't wait for the
+        # creation.
+        cdict = self.__cdicts.get(level)
+        if cdict is not None:
+            return cdict
+
         with self.__lock:
-            # Already cached
+            # Another thread may have created it while this thread was
+            # waiting for the lock.
             if level in self.__cdicts:
                 cdict = self.__cdicts[level]
             else:
                 # Create ZSTD_CDict instance
-                cdict = m.ZSTD_createCDict(ffi.from_buffer(self.__dict_content),
-                                           len(self.__dict_content), level)
+                cdict = m.ZSTD_createCDict(self._dict_cdata,
+                                           self._dict_len, level)
                 if cdict == ffi.NULL:
                     msg = ("Failed to create ZSTD_CDict instance from zstd "
                            "dictionary content. Maybe the content is corrupted.")
@@ -155,10 +168,14 @@ class ZstdDict:
             return self.__ddict
 
         with self.__lock:
+            # Another thread may have created it while this thread was
+            # waiting for the lock.
+            if self.__ddict != ffi.NULL:
+                return self.__ddict
+
             # Create ZSTD_DDict instance from dictionary content
-            self.__ddict = m.ZSTD_createDDict(
-                                    ffi.from_buffer(self.__dict_content),
-                                    len(self.__dict_content))
+            self.__ddict = m.ZSTD_createDDict(self._dict_cdata,
+                                              self._dict_len)
 
             if self.__ddict == ffi.NULL:
                 msg = ("Failed to create ZSTD_DDict instance from zstd "
@@ -194,14 +211,14 @@ def _load_c_dict(cctx, zstd_dict, level):
         # It doesn't override compression context's parameters.
         zstd_ret = m.ZSTD_CCtx_loadDictionary(
                                     cctx,
-                                    ffi.from_buffer(zd.dict_content),
-                                    len(zd.dict_content))
+                                    zd._dict_cdata,
+                                    zd._dict_len)
     elif type == _DICT_TYPE_PREFIX:
         # Reference as prefix
         zstd_ret = m.ZSTD_CCtx_refPrefix(
                                     cctx,
-                                    ffi.from_buffer(zd.dict_content),
-                                    len(zd.dict_content))
+                                    zd._dict_cdata,
+                                    zd._dict_len)
     else:
         raise SystemError('_load_c_dict() impossible code path')
 
@@ -233,14 +250,14 @@ def _load_d_dict(dctx, zstd_dict):
         # Load a dictionary
         zstd_ret = m.ZSTD_DCtx_loadDictionary(
                                     dctx,
-                                    ffi.from_buffer(zd.dict_content),
-                                    len(zd.dict_content))
+                                    zd._dict_cdata,
+                                    zd._dict_len)
     elif type == _DICT_TYPE_PREFIX:
         # Reference as prefix
         zstd_ret = m.ZSTD_DCtx_refPrefix(
                                     dctx,
-                                    ffi.from_buffer(zd.dict_content),
-                                    len(zd.dict_content))
+                                    zd._dict_cdata,
+                                    zd._dict_len)
     else:
         raise SystemError('_load_d_dict() impossible code path')
 
@@ -7,6 +7,11 @@ from .output_buffer import _BlocksOutputBuffer
 
 _ZSTD_DStreamOutSize = _ZSTD_DStreamSizes[1]
 
+# readall() trusts the content size in a frame header up to this size.
+# The header is not verified until the frame is decompressed, a corrupt
+# header may claim any size.
+_READALL_PRESIZE_MAX = 16*1024*1024
+
 class ZstdFileReader:
     def __init__(self, fp, zstd_dict, option, read_size):
         if read_size <= 0:
@@ -55,6 +60,15 @@ class ZstdFileReader:
         except AttributeError:
             pass
 
+    # Read a chunk from fp, and set it as input buffer.
+    # If fp is at EOF, in_b.size is 0.
+    def _read_input(self):
+        in_b = self._in_buf
+        self._in_dat = self._fp.read(self._read_size)
+        in_b.src = ffi.from_buffer(self._in_dat)
+        in_b.size = _nbytes(self._in_dat)
+        in_b.pos = 0
+
     def _decompress_into(self, out_b, fill_full):
         # Return
         if self.eof or out_b.size == out_b.pos:
@@ -65,9 +79,9 @@ class ZstdFileReader:
         while True:
             if in_b.size == in_b.pos and self._needs_input:
                 # Read
-                self._in_dat = self._fp.read(self._read_size)
+                self._read_input()
                 # EOF
-                if not self._in_dat:
+                if in_b.size == 0:
                     if self._at_frame_edge:
                         self.eof = True
                         self.pos += out_b.pos - orig_pos
@@ -76,9 +90,6 @@ class ZstdFileReader:
                     else:
                         raise EOFError("Compressed file ended before the "
                                        "end-of-stream marker was reached")
-                in_b.src = ffi.from_buffer(self._in_dat)
-                in_b.size = _nbytes(self._in_dat)
-                in_b.pos = 0
 
             # Decompress
             zstd_ret = m.ZSTD_decompressStream(self._dctx, out_b, in_b)
@@ -105,8 +116,11 @@ class ZstdFileReader:
                     return
 
     def readinto(self, b):
+        # Keep the cdata alive, it holds the buffer until decompression
+        # finishes.
+        dst = ffi.from_buffer(b)
         out_b = self._out_buf
-        out_b.dst = ffi.from_buffer(b)
+        out_b.dst = dst
         out_b.size = _nbytes(b)
         out_b.pos = 0
 
@@ -121,7 +135,26 @@ class ZstdFileReader:
             out.initWithSize(out_b, -1, self.size - self.pos)
         else:
             # Unknown file size
-            out.initAndGrow(out_b, -1)
+            content_size = m.ZSTD_CONTENTSIZE_UNKNOWN
+
+            # At a frame edge, the frame header may record the decompressed
+            # size. Use it as the initial size, so that a single frame file
+            # is decompressed into one exactly-sized bytes object, if the
+            # size is not too large.
+            if self._at_frame_edge and not self.eof:
+                in_b = self._in_buf
+                if in_b.size == in_b.pos:
+                    self._read_input()
+                content_size = m.ZSTD_getFrameContentSize(
+                                    ffi.cast("char *", in_b.src) + in_b.pos,
+                                    in_b.size - in_b.pos)
+
+            # ZSTD_CONTENTSIZE_UNKNOWN and ZSTD_CONTENTSIZE_ERROR are always
+            # > _READALL_PRESIZE_MAX.
+            if content_size <= _READALL_PRESIZE_MAX:
+                out.initWithSize(out_b, -1, content_size)
+            else:
+                out.initAndGrow(out_b, -1)
 
         while True:
             self._decompress_into(out_b, True)
@@ -235,9 +268,11 @@ class ZstdFileWriter:
         # Output size
         output_size = 0
 
-        # Input buffer
+        # Input buffer. Keep the cdata alive, it holds the buffer until
+        # compression finishes.
+        src = ffi.from_buffer(data)
         in_b = self._in_buf
-        in_b.src = ffi.from_buffer(data)
+        in_b.src = src
         in_b.size = _nbytes(data)
         in_b.pos = 0
 
@@ -258,13 +293,8 @@ class ZstdFileWriter:
                 zstd_ret = m.ZSTD_compressStream2(self._cctx, out_b, in_b,
                                                   m.ZSTD_e_continue)
             else:
-                while True:
-                    zstd_ret = m.ZSTD_compressStream2(self._cctx, out_b, in_b,
-                                                      m.ZSTD_e_continue)
-                    if (out_b.pos == out_b.size
-                           or in_b.pos == in_b.size
-                           or m.ZSTD_isError(zstd_ret)):
-                        break
+                zstd_ret = m.pyzstd_compress_mt_continue(self._cctx,
+                                                         out_b, in_b)
 
             if m.ZSTD_isError(zstd_ret):
                 _set_zstd_error(_ErrorType.ERR_COMPRESS, zstd_ret)
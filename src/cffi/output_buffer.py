@@ -61,6 +61,23 @@ class _BlocksOutputBuffer:
         out.size = block_size
         out.pos = 0
 
+    # Like initAndGrow(max_length=-1), but use a preallocated first block,
+    # so that the caller can reuse it across calls. It's safe because
+    # finish() always copies the data to a new bytes object.
+    def initWithBlock(self, out, block):
+        block_size = len(block)
+
+        # Create the list
+        self.list = [block]
+
+        # Set variables
+        self.allocated = block_size
+        self.max_length = -1
+
+        out.dst = block
+        out.size = block_size
+        out.pos = 0
+
     def grow(self, out):
         # Ensure no gaps in the data
         assert out.pos == out.size
@@ -107,19 +124,11 @@ class _BlocksOutputBuffer:
            (len(self.list) == 2 and out.pos == 0):
             return bytes(ffi.buffer(self.list[0]))
 
-        # Final bytes object
-        data_size = self.allocated - (out.size-out.pos)
-        final = _new_nonzero("char[]", data_size)
-        if final == ffi.NULL:
-            raise MemoryError(self.MEM_ERR_MSG)
-
-        # Memory copy
+        # bytes.join() allocates the final bytes object once, and copies
+        # each block into it, no intermediate buffer.
         # Blocks except the last one
-        posi = 0
-        for block in self.list[:-1]:
-            ffi.memmove(final+posi, block, len(block))
-            posi += len(block)
+        buffers = [ffi.buffer(block) for block in self.list[:-1]]
         # The last block
-        ffi.memmove(final+posi, self.list[-1], out.pos)
+        buffers.append(ffi.buffer(self.list[-1], out.pos))
 
-        return bytes(ffi.buffer(final))
\ No newline at end of file
+        return b''.join(buffers)
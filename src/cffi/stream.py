@@ -153,12 +153,7 @@ def compress_stream(input_stream, output_stream, *,
 
                 # Compress
                 if use_multithread and end_directive == m.ZSTD_e_continue:
-                    while True:
-                        zstd_ret = m.ZSTD_compressStream2(cctx, out_buf, in_buf, m.ZSTD_e_continue)
-                        if (out_buf.pos == out_buf.size
-                              or in_buf.pos == in_buf.size
-                              or m.ZSTD_isError(zstd_ret)):
-                            break
+                    zstd_ret = m.pyzstd_compress_mt_continue(cctx, out_buf, in_buf)
                 else:
                     zstd_ret = m.ZSTD_compressStream2(cctx, out_buf, in_buf, end_directive)
 
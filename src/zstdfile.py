@@ -7,10 +7,82 @@ except ImportError:
         pass
 
 from pyzstd import ZstdCompressor, ZstdFileReader, \
-                   ZstdFileWriter, _ZSTD_DStreamSizes
+                   ZstdFileWriter, ZstdError, _ZSTD_CStreamSizes, \
+                   _ZSTD_DStreamSizes, get_frame_info
 
 __all__ = ('ZstdFile', 'open')
 
+# Get the decompressed size of a seekable zstd file, by walking the frame
+# headers and block headers, without decompressing.
+# Return None if a frame doesn't record the decompressed size, or the data
+# is unexpected (e.g. truncated or corrupted). In these cases, the caller
+# should get the size by decompressing, which reports the error if any.
+def _get_decompressed_size(fp):
+    orig_pos = fp.tell()
+    try:
+        file_size = fp.seek(0, 2) # 2 is SEEK_END
+        pos = 0
+        size = 0
+        while True:
+            if pos == file_size:
+                return size
+            elif pos > file_size:
+                return None
+
+            fp.seek(pos)
+            header = fp.read(18)
+            if len(header) < 8:
+                return None
+
+            magic_number = int.from_bytes(header[:4], 'little')
+            if magic_number & 0xFFFFFFF0 == 0x184D2A50:
+                # Skippable frame: Magic_Number + Frame_Size + User_Data
+                pos += 8 + int.from_bytes(header[4:8], 'little')
+                continue
+            elif magic_number != 0xFD2FB528:
+                return None
+
+            try:
+                decompressed_size = get_frame_info(header).decompressed_size
+            except ZstdError:
+                return None
+            if decompressed_size is None:
+                return None
+            size += decompressed_size
+
+            # Frame_Header_Descriptor
+            descriptor = header[4]
+            single_segment = descriptor & 0x20
+            pos += (4 + 1 +
+                    (0 if single_segment else 1) +   # Window_Descriptor
+                    (0, 1, 2, 4)[descriptor & 0x03] + # Dictionary_ID
+                    (1 if single_segment else 0,      # Frame_Content_Size
+                     2, 4, 8)[descriptor >> 6])
+
+            # Blocks
+            while True:
+                fp.seek(pos)
+                block_header = fp.read(3)
+                if len(block_header) != 3:
+                    return None
+                block_header = int.from_bytes(block_header, 'little')
+                block_type = (block_header >> 1) & 0x03
+                if block_type == 1:    # RLE_Block
+                    pos += 3 + 1
+                elif block_type == 3:  # Reserved
+                    return None
+                else:                  # Raw_Block, Compressed_Block
+                    pos += 3 + (block_header >> 3)
+                # Last_Block
+                if block_header & 0x01:
+                    break
+
+            # Content_Checksum
+            if descriptor & 0x04:
+                pos += 4
+    finally:
+        fp.seek(orig_pos)
+
 class ZstdDecompressReader(io.RawIOBase):
     """Adapt decompressor to RawIOBase reader API"""
 
@@ -47,10 +119,17 @@ class ZstdDecompressReader(io.RawIOBase):
         elif whence == 1:  # SEEK_CUR
             offset = self._decomp.pos + offset
         elif whence == 2:  # SEEK_END
-            if self._decomp.size < 0:
-                # Get file size
-                self._decomp.forward(None)
-            offset = self._decomp.size + offset
+            size = self._decomp.size
+            if size < 0:
+                # Get file size from frame headers. If not possible,
+                # decompress to EOF. The headers are not verified, so the
+                # size is only used to compute the offset, .size is set
+                # when EOF is reached.
+                size = _get_decompressed_size(self._fp)
+                if size is None:
+                    self._decomp.forward(None)
+                    size = self._decomp.size
+            offset = size + offset
         else:
             raise ValueError("Invalid whence value: {}".format(whence))
 
@@ -68,6 +147,7 @@ class ZstdDecompressReader(io.RawIOBase):
 
         return self._decomp.pos
 
+_ZSTD_CStreamInSize = _ZSTD_CStreamSizes[0]
 _ZSTD_DStreamOutSize = _ZSTD_DStreamSizes[1]
 
 _MODE_CLOSED = 0
@@ -246,6 +326,39 @@ class ZstdFile(io.BufferedIOBase):
         self._pos += input_size
         return input_size
 
+    def writelines(self, lines):
+        """Write an iterable of bytes-like objects to the file.
+
+        Line separators are not added. Short lines are joined into
+        ZSTD_CStreamInSize chunks before writing, to reduce per-line
+        overhead. Long lines are written directly, without copying.
+        """
+        if self._mode != _MODE_WRITE:
+            self._check_mode(_MODE_WRITE)
+
+        buf = bytearray()
+        for line in lines:
+            if isinstance(line, (bytes, bytearray)):
+                size = len(line)
+            else:
+                with memoryview(line) as view:
+                    size = view.nbytes
+
+            if size >= _ZSTD_CStreamInSize:
+                # Keep the order, write the pending short lines first.
+                if buf:
+                    self.write(buf)
+                    buf.clear()
+                self.write(line)
+                continue
+
+            buf += line
+            if len(buf) >= _ZSTD_CStreamInSize:
+                self.write(buf)
+                buf.clear()
+        if buf:
+            self.write(buf)
+
     # If modify this method, also modify SeekableZstdFile.flush() method.
     def flush(self, mode=FLUSH_BLOCK):
         """Flush remaining data to the underlying stream.
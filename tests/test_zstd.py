@@ -13,6 +13,7 @@ import platform
 import random
 import subprocess
 import tempfile
+import threading
 import unittest
 
 import pyzstd
@@ -165,6 +166,155 @@ class FunctionsTestCase(unittest.TestCase):
             dat2 = decompress(dat1)
             self.assertEqual(dat2, raw_dat)
 
+    def test_compress_reuse_compressor(self):
+        # compress() reuses the compressor of the same level in a thread
+        raw_dat = THIS_FILE_BYTES[:len(THIS_FILE_BYTES)//6]
+        for level in (None, 1, 1, 5, -3, 5):
+            dat1 = compress(raw_dat, level)
+            dat2 = ZstdCompressor(level).compress(raw_dat,
+                                                  ZstdCompressor.FLUSH_FRAME)
+            self.assertEqual(dat1, dat2)
+            self.assertEqual(compress(b'', level), compress(b'', level))
+
+        # richmem_compress()
+        for level in (None, 1, 1, 5):
+            dat1 = richmem_compress(raw_dat, level)
+            dat2 = RichMemZstdCompressor(level).compress(raw_dat)
+            self.assertEqual(dat1, dat2)
+
+        # With dictionary, not cached
+        for zd in (TRAINED_DICT, TRAINED_DICT,
+                   TRAINED_DICT.as_digested_dict,
+                   TRAINED_DICT.as_digested_dict,
+                   TRAINED_DICT.as_undigested_dict):
+            for func in (compress, richmem_compress):
+                dat1 = func(raw_dat, 5, zd)
+                dat2 = func(raw_dat, 5, zd)
+                self.assertEqual(dat1, dat2)
+                self.assertEqual(decompress(dat2, TRAINED_DICT), raw_dat)
+        results = []
+        def f():
+            # Run in a new thread, the cache is empty.
+            compress(raw_dat, 5, TRAINED_DICT)
+            richmem_compress(raw_dat, 5, TRAINED_DICT)
+            results.append(vars(pyzstd._compress_cache))
+        t = threading.Thread(target=f)
+        t.start()
+        t.join()
+        self.assertEqual(results, [{}])
+
+        # Prefix only works for the first frame
+        zd = ZstdDict(raw_dat, is_raw=True)
+        expected = (
+            ZstdCompressor(5, zd.as_prefix).compress(
+                                    raw_dat, ZstdCompressor.FLUSH_FRAME),
+            RichMemZstdCompressor(5, zd.as_prefix).compress(raw_dat))
+        for func, exp in zip((compress, richmem_compress), expected):
+            dat1 = func(raw_dat, 5, zd.as_prefix)
+            dat2 = func(raw_dat, 5, zd.as_prefix)
+            self.assertEqual(dat1, exp)
+            self.assertEqual(dat2, exp)
+            self.assertEqual(decompress(dat2, zd.as_prefix), raw_dat)
+
+        # After an exception, same error message as the compressor
+        for func, comp in (
+                (compress, lambda d: ZstdCompressor(5).compress(
+                                        d, ZstdCompressor.FLUSH_FRAME)),
+                (richmem_compress, RichMemZstdCompressor(5).compress)):
+            with self.assertRaises(TypeError) as cm:
+                comp({})
+            with self.assertRaisesRegex(TypeError,
+                                        re.escape(str(cm.exception))):
+                func({}, 5)
+        self.assertEqual(decompress(compress(raw_dat, 5)), raw_dat)
+
+        # Other threads
+        results = []
+        def f():
+            results.append(decompress(compress(raw_dat, 5)))
+        threads = [threading.Thread(target=f) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, [raw_dat] * 4)
+
+    def test_compress_cache_large_input(self):
+        # A large input gets a fresh compressor, the cache doesn't keep
+        # its large compression context.
+        cache = pyzstd._compress_cache
+        large = b'a' * (pyzstd._COMPRESS_CACHE_MAX_SIZE + 1)
+        results = []
+        def f():
+            for func, cls in ((compress, ZstdCompressor),
+                              (richmem_compress, RichMemZstdCompressor)):
+                name = cls.__name__
+                results.append(decompress(func(large, 19)) == large)
+                results.append(getattr(cache, name, None) is None)
+
+                # Doesn't replace a cached compressor
+                results.append(decompress(func(b'abc', 19)) == b'abc')
+                cached = getattr(cache, name)
+                results.append(decompress(func(large, 19)) == large)
+                results.append(getattr(cache, name) is cached)
+        # Run in a new thread, the cache is empty.
+        t = threading.Thread(target=f)
+        t.start()
+        t.join()
+        self.assertEqual(results, [True] * 10)
+
+    def test_decompress_reuse_decompressor(self):
+        # decompress() reuses the decompression context
+        raw_dat = THIS_FILE_BYTES[:len(THIS_FILE_BYTES)//6]
+        dat = compress(raw_dat)
+        for _ in range(3):
+            self.assertEqual(decompress(dat), raw_dat)
+
+        # After an incomplete frame, or an exception
+        with self.assertRaisesRegex(ZstdError, 'incomplete frame'):
+            decompress(dat[:-1])
+        self.assertEqual(decompress(dat), raw_dat)
+        with self.assertRaises(ZstdError):
+            decompress(b'a' * 100)
+        self.assertEqual(decompress(dat), raw_dat)
+
+        # Dictionary and option are not kept
+        dict_dat = compress(raw_dat, zstd_dict=TRAINED_DICT)
+        self.assertEqual(decompress(dict_dat, TRAINED_DICT), raw_dat)
+        with self.assertRaises(ZstdError):
+            decompress(dict_dat)
+        option = {DParameter.windowLogMax: 10}
+        big_window = compress(raw_dat, {CParameter.windowLog: 20,
+                                        CParameter.contentSizeFlag: 0})
+        with self.assertRaises(ZstdError):
+            decompress(big_window, option=option)
+        self.assertEqual(decompress(big_window), raw_dat)
+
+        # A large decompression context is not kept. Streaming compression
+        # doesn't know the input size, the window is not reduced.
+        c = ZstdCompressor({CParameter.windowLog: 22})
+        big_window = c.compress(raw_dat) + c.flush()
+        self.assertEqual(decompress(big_window), raw_dat)
+        self.assertEqual(decompress(dat), raw_dat)
+        if PYZSTD_CONFIG[1] == 'cffi':
+            from pyzstd.cffi import decompressor
+            decompress(big_window)
+            self.assertEqual(decompressor._decompress_cache, [])
+            decompress(dat)
+            self.assertEqual(len(decompressor._decompress_cache), 1)
+
+        # Other threads
+        results = []
+        def f():
+            for _ in range(10):
+                results.append(decompress(dat))
+        threads = [threading.Thread(target=f) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, [raw_dat] * 40)
+
     def test_get_frame_info(self):
         # no dict
         info = get_frame_info(COMPRESSED_100_PLUS_32KB[:20])
@@ -483,6 +633,11 @@ class ClassShapeTestCase(unittest.TestCase):
         self.assertEqual(type(PYZSTD_CONFIG[3]), bool)
         self.assertEqual(type(PYZSTD_CONFIG[4]), bool)
 
+    def test_no_stray_public_names(self):
+        # Names imported by the pyzstd module itself are private
+        for name in ('array', 'calcsize', 'local'):
+            self.assertFalse(hasattr(pyzstd, name), name)
+
     def test_ZstdFile_extend(self):
         # These classes and variables can be used to extend ZstdFile,
         # such as SeekableZstdFile(ZstdFile), so pin them down.
@@ -1208,6 +1363,21 @@ class CompressorDecompressorTestCase(unittest.TestCase):
         self.assertFalse(d.needs_input)
         self.assertEqual(d.unused_data + bi.read(), TRAIL)
 
+    def test_decompressor_append_unconsumed(self):
+        # Feed input even when .needs_input is False, so the input is
+        # appended to the unconsumed data in the internal buffer.
+        DAT = DAT_130K_C + DAT_130K_C
+        for max_length in (100, 5000):
+            d = EndlessZstdDecompressor()
+            lst = []
+            for i in range(0, len(DAT), 100):
+                lst.append(d.decompress(DAT[i:i+100], max_length))
+            while not d.needs_input:
+                lst.append(d.decompress(b'', max_length))
+
+            self.assertEqual(b''.join(lst), DAT_130K_D + DAT_130K_D)
+            self.assertTrue(d.at_frame_edge)
+
     def test_compress_empty(self):
         # output empty content frame
         self.assertNotEqual(compress(b''), b'')
@@ -1219,6 +1389,15 @@ class CompressorDecompressorTestCase(unittest.TestCase):
         c = RichMemZstdCompressor()
         self.assertNotEqual(c.compress(b''), b'')
 
+        # .CONTINUE mode
+        c = ZstdCompressor()
+        dat1 = c.compress(THIS_FILE_BYTES)
+        self.assertEqual(c.compress(b''), b'')
+        self.assertEqual(c.compress(bytearray()), b'')
+        self.assertEqual(c.last_mode, c.CONTINUE)
+        dat2 = c.flush()
+        self.assertEqual(decompress(dat1 + dat2), THIS_FILE_BYTES)
+
         # output b''
         bi = BytesIO(b'')
         bo = BytesIO()
@@ -1230,6 +1409,15 @@ class CompressorDecompressorTestCase(unittest.TestCase):
 
     def test_decompress_empty(self):
         self.assertEqual(decompress(b''), b'')
+        self.assertEqual(decompress(bytearray()), b'')
+        self.assertEqual(decompress(b'', TRAINED_DICT), b'')
+        self.assertEqual(decompress(b'', option={}), b'')
+        with self.assertRaises(TypeError):
+            decompress('')
+        with self.assertRaises(TypeError):
+            decompress(b'', zstd_dict=b'')
+        with self.assertRaises(TypeError):
+            decompress(b'', option=[])
 
         d = ZstdDecompressor()
         self.assertEqual(d.decompress(b''), b'')
@@ -1772,6 +1960,20 @@ class DecompressorFlagsTestCase(unittest.TestCase):
         self.assertFalse(d.at_frame_edge)
         self.assertTrue(d.needs_input)
 
+    def test_endless_truncated_small_frame(self):
+        # The frame header declares a small size, the first chunk
+        # doesn't contain the whole frame.
+        dat = compress(THIS_FILE_BYTES[:20*1024])
+        for i in (10, len(dat)//2, len(dat)-1):
+            d = EndlessZstdDecompressor()
+            out = d.decompress(dat[:i])
+            self.assertFalse(d.at_frame_edge)
+            self.assertTrue(d.needs_input)
+
+            out += d.decompress(dat[i:])
+            self.assertEqual(out, THIS_FILE_BYTES[:20*1024])
+            self.assertTrue(d.at_frame_edge)
+
     def test_endlessdecompressor_skippable(self):
         # 1 skippable
         d = EndlessZstdDecompressor()
@@ -2067,6 +2269,21 @@ class ZstdDictTestCase(unittest.TestCase):
         with self.assertRaises(ValueError):
             _zstd._train_dict(b'', [2**64+1], 100)
 
+        # samples_bytes can be any bytes-like object
+        samples = bytearray(b'abcdefgh' * 1000)
+        sizes = array.array(pyzstd._SIZE_T_TYPECODE, [len(samples)//100]*100)
+        self.assertGreater(len(_zstd._train_dict(samples, sizes, 1024)), 0)
+        self.assertGreater(len(_zstd._train_dict(memoryview(samples),
+                                                 list(sizes), 1024)), 0)
+
+        # samples_size_list is a buffer of size_t values
+        with self.assertRaises(TypeError):
+            _zstd._train_dict(b'', b'', 100)
+        with self.assertRaises(TypeError):
+            _zstd._train_dict(b'', array.array('b'), 100)
+        with self.assertRaises(ValueError):
+            _zstd._train_dict(b'1', array.array(pyzstd._SIZE_T_TYPECODE, [2]), 100)
+
         # dict_size <= 0
         with self.assertRaises(ValueError):
             _zstd._train_dict(b'', [], 0)
@@ -2100,6 +2317,13 @@ class ZstdDictTestCase(unittest.TestCase):
         with self.assertRaises(ValueError):
             _zstd._finalize_dict(TRAINED_DICT.dict_content, b'', [2**64+1], 100, 5)
 
+        # samples_size_list is a buffer of size_t values
+        with self.assertRaises(TypeError):
+            _zstd._finalize_dict(TRAINED_DICT.dict_content, b'', b'', 100, 5)
+        with self.assertRaises(ValueError):
+            _zstd._finalize_dict(TRAINED_DICT.dict_content, b'1',
+                                 array.array(pyzstd._SIZE_T_TYPECODE, [2]), 100, 5)
+
         # dict_size <= 0
         with self.assertRaises(ValueError):
             _zstd._finalize_dict(TRAINED_DICT.dict_content, b'', [], 0, 5)
@@ -2906,6 +3130,42 @@ class FileTestCase(unittest.TestCase):
         with ZstdFile(BytesIO(COMPRESSED_100_PLUS_32KB + COMPRESSED_DAT)) as f:
             self.assertEqual(f.read(), DECOMPRESSED_100_PLUS_32KB + DECOMPRESSED_DAT)
 
+    def test_read_content_size(self):
+        # readall() uses the frame content size as initial output size
+        dat = compress(THIS_FILE_BYTES)
+        self.assertEqual(get_frame_info(dat).decompressed_size,
+                         len(THIS_FILE_BYTES))
+        with ZstdFile(BytesIO(dat)) as f:
+            self.assertEqual(f.read(), THIS_FILE_BYTES)
+        with ZstdFile(BytesIO(dat * 2)) as f:
+            self.assertEqual(f.read(), THIS_FILE_BYTES * 2)
+        with ZstdFile(BytesIO(SKIPPABLE_FRAME + dat)) as f:
+            self.assertEqual(f.read(), THIS_FILE_BYTES)
+
+        # Partially read, then readall() from a frame edge
+        with ZstdFile(BytesIO(dat * 2), read_size=100) as f:
+            self.assertEqual(f.read(10), THIS_FILE_BYTES[:10])
+            self.assertEqual(f.read(), THIS_FILE_BYTES[10:] + THIS_FILE_BYTES)
+
+        # Frame with 0 content size
+        with ZstdFile(BytesIO(compress(b'') + dat)) as f:
+            self.assertEqual(f.read(), THIS_FILE_BYTES)
+
+    def test_read_content_size_corrupt(self):
+        # The frame header claims 1 TiB, readall() shouldn't allocate
+        # the output buffer with this size.
+        header = (b'\x28\xb5\x2f\xfd'  # magic number
+                  b'\xc0'  # 8 bytes content size
+                  b'\x00'  # 1 KiB window size
+                  + (1024**4).to_bytes(8, 'little'))
+        dat = header + b'\x29\x00\x00hello'  # last raw block
+        self.assertEqual(get_frame_info(dat).decompressed_size, 1024**4)
+
+        with ZstdFile(BytesIO(dat)) as f:
+            self.assertRaises(ZstdError, f.read)
+        with ZstdFile(BytesIO(dat[:-3])) as f:
+            self.assertRaises(EOFError, f.read)
+
     def test_read_incomplete(self):
         with ZstdFile(BytesIO(DAT_130K_C[:-200])) as f:
             self.assertRaises(EOFError, f.read)
@@ -3216,6 +3476,65 @@ class FileTestCase(unittest.TestCase):
             expected = comp(THIS_FILE_BYTES)
             self.assertEqual(dst.getvalue(), expected)
 
+        # Many short lines, bytes-like objects
+        lines = [memoryview(b'%d\n' % i) for i in range(100000)]
+        with BytesIO() as dst:
+            with ZstdFile(dst, "w") as f:
+                f.writelines(lines)
+                self.assertEqual(f.tell(), sum(len(l) for l in lines))
+            self.assertEqual(decompress(dst.getvalue()), b''.join(lines))
+
+        # Long lines mixed with short lines
+        big = os.urandom(300*1024)
+        lines = [b'a', b'bc', big, memoryview(big), b'd',
+                 array.array('I', range(50000)), b'e']
+        with BytesIO() as dst:
+            with ZstdFile(dst, "w") as f:
+                f.writelines(lines)
+                self.assertEqual(f.tell(), sum(len(memoryview(l).cast('B'))
+                                               for l in lines))
+            self.assertEqual(decompress(dst.getvalue()),
+                             b''.join(bytes(l) for l in lines))
+
+        with ZstdFile(BytesIO(COMPRESSED_100_PLUS_32KB)) as f:
+            self.assertRaises(UnsupportedOperation, f.writelines, [])
+        f = ZstdFile(BytesIO(), "w")
+        f.close()
+        self.assertRaises(ValueError, f.writelines, [])
+
+    def test_write_read_hold_buffer(self):
+        # The buffer is held during (de)compression, so fp.write()/fp.read()
+        # can't resize it.
+        class T:
+            def __init__(self, dat):
+                self.dat = dat
+                self.errors = []
+            def read(self, size):
+                self._resize()
+                return b''
+            def write(self, b):
+                self._resize()
+                return len(b)
+            def _resize(self):
+                try:
+                    self.dat.clear()
+                except BufferError as e:
+                    self.errors.append(e)
+
+        dat = bytearray(os.urandom(300*1024))
+        fp = T(dat)
+        with ZstdFile(fp, 'w') as f:
+            f.write(dat)
+            self.assertEqual(len(dat), 300*1024)
+            self.assertTrue(fp.errors)
+
+        b = bytearray(100)
+        fp = T(b)
+        reader = pyzstd.zstdfile.ZstdFileReader(fp, None, None, 131075)
+        self.assertEqual(reader.readinto(b), 0)
+        self.assertEqual(len(b), 100)
+        self.assertTrue(fp.errors)
+
     def test_seek_forward(self):
         with ZstdFile(BytesIO(COMPRESSED_100_PLUS_32KB)) as f:
             f.seek(555)
@@ -3255,6 +3574,65 @@ class FileTestCase(unittest.TestCase):
             f.seek(-150, 2)
             self.assertEqual(f.read(), DECOMPRESSED_100_PLUS_32KB[-150:])
 
+    def test_seek_relative_to_end_frame_headers(self):
+        from pyzstd.zstdfile import _get_decompressed_size
+
+        # RLE/Raw/Compressed blocks, content checksum, skippable frame
+        raw = os.urandom(200*1024)
+        dat1 = compress(b'a' * 300*1024)
+        dat2 = compress(raw, {CParameter.checksumFlag: 1})
+        dat3 = compress(THIS_FILE_BYTES, {CParameter.contentSizeFlag: 1})
+        dat = dat1 + SKIPPABLE_FRAME + dat2 + dat3 + compress(b'')
+        expected = b'a' * 300*1024 + raw + THIS_FILE_BYTES
+        bi = BytesIO(dat)
+        bi.seek(10)
+        self.assertEqual(_get_decompressed_size(bi), len(expected))
+        self.assertEqual(bi.tell(), 10)
+        bi.seek(0)
+        with ZstdFile(bi) as f:
+            f.seek(-100, 2)
+            self.assertEqual(f.read(), expected[-100:])
+
+        # The data is decompressed only once, not to EOF and again from
+        # the beginning.
+        class T(BytesIO):
+            read_bytes = 0
+            def read(self, size=-1):
+                ret = super().read(size)
+                self.read_bytes += len(ret)
+                return ret
+            def readinto(self, b):
+                ret = super().readinto(b)
+                self.read_bytes += ret
+                return ret
+        bi = T(dat)
+        with ZstdFile(bi) as f:
+            f.seek(-100, 2)
+            self.assertEqual(f.read(), expected[-100:])
+        self.assertLess(bi.read_bytes, len(dat) * 1.5)
+
+        # The size in frame headers is not trusted. The header claims
+        # 1 TiB, followed by a last raw block.
+        corrupt = (b'\x28\xb5\x2f\xfd\xc0\x00'
+                   + (1024**4).to_bytes(8, 'little')
+                   + b'\x29\x00\x00hello')
+        self.assertEqual(_get_decompressed_size(BytesIO(corrupt)), 1024**4)
+        with ZstdFile(BytesIO(corrupt)) as f:
+            self.assertEqual(f.seek(-1024**4, 2), 0)
+            self.assertRaises(ZstdError, f.read)
+
+        # Decompressed size unknown
+        bi = BytesIO()
+        with ZstdFile(bi, 'w') as f:
+            f.write(THIS_FILE_BYTES)
+        self.assertIsNone(_get_decompressed_size(bi))
+
+        # Truncated or trailing data
+        self.assertIsNone(_get_decompressed_size(BytesIO(dat1[:-1])))
+        self.assertIsNone(_get_decompressed_size(BytesIO(dat1 + b'1234')))
+        with ZstdFile(BytesIO(dat1[:-1])) as f:
+            self.assertRaises(EOFError, f.seek, 0, 2)
+
     def test_seek_past_end(self):
         with ZstdFile(BytesIO(COMPRESSED_100_PLUS_32KB)) as f:
             f.seek(len(DECOMPRESSED_100_PLUS_32KB) + 9001)